@@ -1,4 +1,6 @@
-from flask import Flask, request, jsonify, abort
+from flask import Flask, request, jsonify, abort, g
+import math
+import os
 import jwt
 from pydantic import ValidationError
 from datetime import datetime, timedelta
@@ -7,20 +9,32 @@ import service as service
 import database
 from schemas import CharacterUpdate, CharacterCreate
 from config import Config
+from user_store import UserStore, LoginBusyError, load_users
+from rate_limit import TokenBucketLimiter, ConcurrencyGate, AdmissionStats, retry_after_header
 
 
 # Inizialisation
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = Config.SQLALCHEMY_DATABASE_URI
 app.config['JWT_SECRET_KEY'] = Config.JWT_SECRET_KEY
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': Config.DB_POOL_SIZE,
+    'max_overflow': Config.DB_MAX_OVERFLOW,
+}
 database.create_database(app)
 
 
-# In-memory user database (replace with a database query)
-users = [
-    {'username': 'user1', 'password': 'password1', 'role': 'user'},
-    {'username': 'admin', 'password': 'adminpassword', 'role': 'admin'},
-]
+# Admission control: per-user token buckets and a gate sized to the DB pool.
+# The buckets and counters are in shared memory created before server.py
+# forks, the gate guards each worker's own connection pool.
+rate_limiter = TokenBucketLimiter(
+    Config.RATE_LIMIT_PER_SECOND, Config.RATE_LIMIT_BURST, Config.RATE_LIMIT_SLOTS)
+db_gate = ConcurrencyGate(Config.DB_POOL_SIZE + Config.DB_MAX_OVERFLOW)
+admission_stats = AdmissionStats()
+
+
+# In-memory user repository keyed by username, loaded with pre-computed hashes
+users = UserStore(load_users(Config.USERS_FILE))
 
 
 # Authentication & Authorization
@@ -78,9 +92,8 @@ def authenticate(username, password):
     """
     Authenticates a user based on username and password.
 
-    **Important:** This is a simplified in-memory authentication example.
-    For production use, implement secure password hashing (e.g., bcrypt)
-    and store hashed passwords in a database.
+    Passwords are checked against their hashes on the user store's
+    bounded worker pool.
 
     Args:
         username (str): The username to authenticate.
@@ -89,17 +102,69 @@ def authenticate(username, password):
     Returns:
         str | None: The user's role if authentication is successful,
             otherwise None.
+
+    Raises:
+        LoginBusyError: If too many logins are already being verified.
+    """
+    return users.verify(username, password)
+
+
+def authorize_request():
     """
-    for user in users:
-        if user['username'] == username and user['password'] == password:
-            return user['role']
+    Verifies the JWT of the current request and stores it as `g.user`.
+
+    Returns:
+        tuple | None: An error response if the token is missing or
+            invalid, otherwise None.
+    """
+    token = request.headers.get('Authorization')
+    if not token:
+        return jsonify({'message': 'Token missing'}), 401
+
+    token = token.split(' ')[1]  # Extract the token from 'Bearer <token>'
+    decoded_token = decode_jwt(token)
+
+    if not decoded_token:
+        return jsonify({'message': 'Invalid token'}), 401
+    g.user = decoded_token
     return None
 
 
+def require_admin(func):
+    """
+    Decorator that only lets requests with an admin JWT through.
+
+    Unlike protect_endpoint it neither spends a rate limit token nor
+    takes a database gate slot, so it suits endpoints that never touch
+    the database, such as monitoring.
+
+    Args:
+        func: The endpoint function to be protected.
+
+    Returns:
+        function: The decorated function that performs the role check.
+    """
+    @wraps(func)
+    def decorated_function(*args, **kwargs):
+        error = authorize_request()
+        if error:
+            return error
+        if g.user.get('role') != 'admin':
+            return jsonify({'message': 'Forbidden'}), 403
+        return func(*args, **kwargs)
+
+    return decorated_function
+
+
 def protect_endpoint(func):
     """
     Decorator that verifies JWT authorization for a protected endpoint.
 
+    Valid requests are then admitted through the per-user rate limiter
+    (429 when exhausted) and the database concurrency gate (503 when full).
+    Both rejections carry a Retry-After header and never queue.
+    The decoded token is available to the endpoint as `g.user`.
+
     Args:
         func: The endpoint function to be protected.
 
@@ -108,17 +173,26 @@ def protect_endpoint(func):
     """
     @wraps(func)
     def decorated_function(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        if not token:
-            return jsonify({'message': 'Token missing'}), 401
-
-        token = token.split(' ')[1]  # Extract the token from 'Bearer <token>'
-        decoded_token = decode_jwt(token)
-
-        if decoded_token:
+        error = authorize_request()
+        if error:
+            return error
+
+        retry_after = rate_limiter.acquire(g.user.get('username'))
+        if retry_after:
+            admission_stats.incr('rate_limited')
+            return jsonify({'message': 'Rate limit exceeded'}), 429, retry_after_header(retry_after)
+
+        if not db_gate.try_enter():
+            admission_stats.incr('overloaded')
+            return jsonify({'message': 'Server busy, try again later'}), 503, retry_after_header(1)
+
+        admission_stats.incr('admitted')
+        admission_stats.incr('in_flight')
+        try:
             return func(*args, **kwargs)
-        else:
-            return jsonify({'message': 'Invalid token'}), 401
+        finally:
+            admission_stats.incr('in_flight', -1)
+            db_gate.leave()
 
     return decorated_function
 
@@ -131,12 +205,15 @@ def login():
 
     Returns:
         JSON: A response containing the JWT token or an error message
-            if authentication fails.
+            if authentication fails, or 503 if the login pool is saturated.
     """
     username = request.json.get('username', None)
     password = request.json.get('password', None)
     
-    role = authenticate(username, password)
+    try:
+        role = authenticate(username, password)
+    except LoginBusyError as e:
+        return jsonify({'message': str(e)}), 503, {'Retry-After': '1'}
 
     if role:
         token = generate_jwt(username, role)
@@ -145,6 +222,32 @@ def login():
         return jsonify({'message': 'Invalid credentials'}), 401
 
 
+@app.route('/metrics', methods=['GET'])
+@require_admin
+def metrics():
+    """
+    Exposes admission control counters for monitoring. Admins only.
+
+    The endpoint bypasses the rate limiter and the database gate, so it
+    still answers while the gate is full. Under server.py the counters
+    are shared by all workers; with `--no-preload` they belong to the
+    worker that answers (`pid`).
+
+    `in_flight` is decremented when a request finishes. A worker killed
+    mid-request (e.g. after `graceful_timeout`) never does that, so the
+    counter then stays too high until the server is restarted.
+
+    Returns:
+        JSON: Counts of admitted, rate limited, overloaded and
+            cost-rejected requests, plus requests currently in flight,
+            or 403 if the caller is not an admin.
+    """
+    stats = admission_stats.snapshot()
+    stats['db_gate_limit'] = db_gate.limit
+    stats['pid'] = os.getpid()
+    return jsonify(stats)
+
+
 # Endpoints
 @app.route('/characters', methods=['GET'])
 @protect_endpoint
@@ -161,15 +264,31 @@ def get_characters():
             - A list of characters matching the specified
                 filters and pagination parameters.
             - An empty list if no characters match the criteria.
+            - 400 Bad Request: If `limit` exceeds `Config.MAX_PAGE_LIMIT`
+                or `limit + skip` exceeds `Config.MAX_QUERY_COST`.
     """
     filters = []
+    try:
+        fields = service.parse_fields(request.args.get('fields'))
+        limit = int(request.args.get('limit', 20))
+        skip = int(request.args.get('skip', 0))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order')
-    limit = int(request.args.get('limit', 20))
-    skip = int(request.args.get('skip', 0))
+
+    if limit < 0 or skip < 0:
+        return jsonify({'error': 'limit and skip must not be negative'}), 400
+    if limit > Config.MAX_PAGE_LIMIT:
+        admission_stats.incr('rejected_cost')
+        return jsonify({'error': f'limit must not exceed {Config.MAX_PAGE_LIMIT}'}), 400
+    # Rows the database has to walk through: OFFSET scans skipped rows too
+    if limit + skip > Config.MAX_QUERY_COST:
+        admission_stats.incr('rejected_cost')
+        return jsonify({'error': f'limit + skip must not exceed {Config.MAX_QUERY_COST}'}), 400
 
     for key, value in request.args.items():
-        if key not in ("sort_by", "sort_order", "limit", "skip"):
+        if key not in ("sort_by", "sort_order", "limit", "skip", "fields"):
             filters.append({key: value})
     # Call the filtering for house and strength filters inside the function
     # Call other filters
@@ -178,11 +297,12 @@ def get_characters():
     if sort_by:
         characters = service.characters_sort(characters, sort_order, sort_by)
 
+    characters = characters.options(*service.character_load_options(fields))
     characters = characters.limit(limit).offset(skip).all()
     if not characters:
         abort(404, description='Not Found: The requested page or resource could not be found')
 
-    return jsonify([character.to_dict() for character in characters])
+    return jsonify([character.to_dict(fields) for character in characters])
         
 
 @app.route('/characters/<int:id>', methods=['GET'])
@@ -197,15 +317,68 @@ def get_character_by_id(id):
     Returns:
         JSON response:
             - 200 OK: If the character is found and returned.
+            - 400 Bad Request: If `fields` names an unknown field.
             - 404 Not Found: If the character is not found.
     """
-    character_data = service.get_character(id)
+    try:
+        fields = service.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    character_data = service.get_character(id, fields)
     if character_data:
         return jsonify(character_data)
     else:
         abort(404, description="Character not found")
 
 
+@app.route('/characters/lookup', methods=['POST'])
+@protect_endpoint
+def lookup_characters():
+    """
+    Retrieves many characters by their IDs in a single request.
+
+    Request Body:
+        A JSON object containing the following field:
+        - `ids` (list[int], required): The IDs of the characters to fetch.
+        At most `Config.MAX_LOOKUP_IDS` IDs are accepted, capped by
+        `Config.MAX_QUERY_COST`. The request costs one rate limit token
+        per `Config.MAX_PAGE_LIMIT` IDs, at most a full bucket.
+        The optional `fields` query parameter restricts the returned keys.
+
+    Returns:
+        JSON response:
+            - 200 OK: `characters` in request order and the `missing` IDs.
+            - 400 Bad Request: If `ids` is missing, not a list of integers
+            or longer than the allowed maximum, or `fields` is invalid.
+            - 429 Too Many Requests: If the caller lacks the tokens for
+            the size of the lookup.
+    """
+    try:
+        fields = service.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not all(
+            isinstance(id, int) and not isinstance(id, bool) for id in ids):
+        return jsonify({'error': 'ids must be a list of integers'}), 400
+    max_ids = min(Config.MAX_LOOKUP_IDS, Config.MAX_QUERY_COST)
+    if len(ids) > max_ids:
+        admission_stats.incr('rejected_cost')
+        return jsonify({'error': f'Too many ids: at most {max_ids} allowed'}), 400
+    # Charged like the pages of GET /characters it replaces, capped at a
+    # full bucket; the first token was already spent by protect_endpoint
+    cost = min(max(1, math.ceil(len(ids) / Config.MAX_PAGE_LIMIT)), rate_limiter.burst)
+    if cost > 1:
+        retry_after = rate_limiter.acquire(g.user.get('username'), cost - 1)
+        if retry_after:
+            admission_stats.incr('rate_limited')
+            return jsonify({'message': 'Rate limit exceeded'}), 429, retry_after_header(retry_after)
+
+    characters, missing = service.get_characters_by_ids(ids, fields)
+    return jsonify({'characters': characters, 'missing': missing})
+
+
 @app.route('/characters', methods=['POST'])
 @protect_endpoint
 def create_character():
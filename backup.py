@@ -0,0 +1,247 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, select, func, text, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
+import json_parcer
+from config import Config
+from models import Character, House, Strength
+
+
+MANIFEST_NAME = 'manifest.json'
+
+# Parents first, so foreign keys resolve on restore
+TABLES = [House.__table__, Strength.__table__, Character.__table__]
+
+
+def create_backup(directory, chunk_size=5000, since=None, database_uri=None):
+    """
+    Streams the database into compact, checksummed chunk files.
+
+    Rows are read through a server-side cursor and written `chunk_size`
+    rows at a time, so memory stays bounded by one chunk. All tables are
+    read in one snapshot transaction, so every exported character has its
+    house and strength in the same backup. With `since`, only characters
+    modified after that marker are exported; the small house and strength
+    tables are always exported in full.
+
+    The marker recorded for the next incremental backup is the database's
+    own clock at the start of the snapshot, minus
+    Config.BACKUP_OVERLAP_SECONDS so rows written by transactions that were
+    still open at that point are exported again next time. Restore is an
+    upsert, so exporting a row twice is harmless.
+
+    Args:
+        directory (str): The directory to write the chunks and manifest to.
+        chunk_size (int): Rows per chunk file.
+        since (datetime | None): Marker of a previous backup for an
+            incremental backup, or None for a full one.
+        database_uri (str | None): Overrides Config.SQLALCHEMY_DATABASE_URI.
+
+    Returns:
+        dict: The manifest that was written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    engine = create_engine(database_uri or Config.SQLALCHEMY_DATABASE_URI)
+    # SQLite has no REPEATABLE READ, a SERIALIZABLE transaction is its snapshot
+    isolation_level = 'REPEATABLE READ' if engine.dialect.name == 'postgresql' else 'SERIALIZABLE'
+    chunks = []
+
+    try:
+        with engine.connect() as connection:
+            connection = connection.execution_options(
+                isolation_level=isolation_level, stream_results=True, yield_per=chunk_size)
+            with connection.begin():
+                marker = _database_now(connection) - timedelta(seconds=Config.BACKUP_OVERLAP_SECONDS)
+                for table in TABLES:
+                    stmt = select(table).order_by(table.c.id)
+                    if since is not None and 'updated_at' in table.c:
+                        stmt = stmt.where(table.c.updated_at > since)
+                    result = connection.execute(stmt)
+                    for number, rows in enumerate(result.mappings().partitions()):
+                        file_name = f'{table.name}-{number:05d}.json.gz'
+                        records = [dict(row) for row in rows]
+                        checksum = json_parcer.write_chunk(
+                            os.path.join(directory, file_name), records)
+                        chunks.append({
+                            'table': table.name,
+                            'file': file_name,
+                            'rows': len(records),
+                            'sha256': checksum,
+                        })
+    finally:
+        engine.dispose()
+
+    manifest = {
+        'marker': marker.isoformat(),
+        'since': since.isoformat() if since else None,
+        'chunks': chunks,
+    }
+    json_parcer.write_file(os.path.join(directory, MANIFEST_NAME), manifest)
+    return manifest
+
+
+def _database_now(connection):
+    # In Postgres now() is the start of the current transaction
+    value = connection.execute(select(func.now())).scalar()
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        # SQLite's CURRENT_TIMESTAMP is UTC without an offset
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def load_marker(directory):
+    """
+    Reads the last-modified marker of an existing backup.
+
+    Args:
+        directory (str): The directory of a previous backup.
+
+    Returns:
+        datetime: The marker to pass as `since` to create_backup.
+
+    Raises:
+        ValueError: If the directory has no manifest.
+    """
+    manifest = json_parcer.load_data(os.path.join(directory, MANIFEST_NAME))
+    if not manifest:
+        raise ValueError(f'No backup manifest found in {directory}')
+    return datetime.fromisoformat(manifest['marker'])
+
+
+_worker_engine = None
+
+
+def _init_worker(database_uri):
+    # Every worker process opens its own engine; pools must not cross a fork
+    global _worker_engine
+    _worker_engine = create_engine(database_uri)
+
+
+def _parse_row(table, record):
+    for column in table.c:
+        value = record.get(column.name)
+        if isinstance(column.type, DateTime) and isinstance(value, str):
+            record[column.name] = datetime.fromisoformat(value)
+    return record
+
+
+def _upsert(dialect_name, table):
+    # Updating rows in place keeps the rows that reference them valid,
+    # so incremental chunks and re-runs apply on a non-empty database
+    if dialect_name == 'postgresql':
+        stmt = postgresql.insert(table)
+    elif dialect_name == 'sqlite':
+        stmt = sqlite.insert(table)
+    else:
+        raise ValueError(f'Restore does not support the {dialect_name} dialect')
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={column.name: stmt.excluded[column.name]
+              for column in table.c if column.name != 'id'})
+
+
+def _restore_chunk(table_name, file_path, checksum, batch_size):
+    table = next(table for table in TABLES if table.name == table_name)
+    records = [_parse_row(table, record)
+               for record in json_parcer.read_chunk(file_path, checksum)]
+    stmt = _upsert(_worker_engine.dialect.name, table)
+    with _worker_engine.begin() as connection:
+        for start in range(0, len(records), batch_size):
+            connection.execute(stmt, records[start:start + batch_size])
+    return len(records)
+
+
+def _reset_sequences(database_uri):
+    engine = create_engine(database_uri)
+    try:
+        if engine.dialect.name != 'postgresql':
+            return
+        with engine.begin() as connection:
+            for table in TABLES:
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"))
+    finally:
+        engine.dispose()
+
+
+def restore_backup(directory, workers=None, batch_size=1000, database_uri=None):
+    """
+    Restores a backup written by create_backup.
+
+    Chunks are verified against their checksums and inserted in batches
+    by a pool of worker processes. Tables are restored one after another
+    in TABLES order so foreign keys resolve; chunks of the same table
+    run in parallel. Rows are upserted by id, so a backup can be restored
+    again or on top of existing data. Apply a full backup first, then its
+    incremental backups in order.
+
+    Upserting by id does not resolve unique name clashes: if a name has
+    moved to a different id since the target database was written, the
+    batch holding it fails with an IntegrityError.
+
+    Args:
+        directory (str): The backup directory.
+        workers (int | None): Number of worker processes, defaults to the CPU count.
+        batch_size (int): Rows per INSERT statement.
+        database_uri (str | None): Overrides Config.SQLALCHEMY_DATABASE_URI.
+
+    Returns:
+        dict: The number of restored rows per table.
+
+    Raises:
+        ValueError: If the manifest is missing or a chunk fails its checksum.
+    """
+    database_uri = database_uri or Config.SQLALCHEMY_DATABASE_URI
+    manifest = json_parcer.load_data(os.path.join(directory, MANIFEST_NAME))
+    if not manifest:
+        raise ValueError(f'No backup manifest found in {directory}')
+
+    restored = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(database_uri,)) as pool:
+        for table in TABLES:
+            futures = [
+                pool.submit(_restore_chunk, table.name,
+                            os.path.join(directory, chunk['file']),
+                            chunk['sha256'], batch_size)
+                for chunk in manifest['chunks'] if chunk['table'] == table.name
+            ]
+            restored[table.name] = sum(future.result() for future in futures)
+
+    _reset_sequences(database_uri)
+    return restored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Back up or restore the character database.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backup_parser = commands.add_parser('backup', help='Write a backup to a directory.')
+    backup_parser.add_argument('directory')
+    backup_parser.add_argument('--chunk-size', type=int, default=5000)
+    backup_parser.add_argument('--since', metavar='PREVIOUS_BACKUP_DIR',
+                               help='Only export characters changed since that backup.')
+
+    restore_parser = commands.add_parser('restore', help='Restore a backup directory.')
+    restore_parser.add_argument('directory')
+    restore_parser.add_argument('--workers', type=int, default=None)
+    restore_parser.add_argument('--batch-size', type=int, default=1000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'backup':
+        since = load_marker(args.since) if args.since else None
+        manifest = create_backup(args.directory, args.chunk_size, since)
+        rows = sum(chunk['rows'] for chunk in manifest['chunks'])
+        print(f"Backed up {rows} rows in {len(manifest['chunks'])} chunks to {args.directory}")
+    else:
+        restored = restore_backup(args.directory, args.workers, args.batch_size)
+        print(f'Restored rows: {restored}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples, pct):
+    """
+    Returns the pct-th percentile of a list of samples.
+
+    Args:
+        samples (list): The measured values.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or 0.0 for an empty list.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class HttpClient:
+    """Sends requests to a running server, e.g. one started by server.py."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json', **(headers or {})})
+        try:
+            with urllib.request.urlopen(req) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+class TestClient:
+    """Sends requests through the in-process Flask test client."""
+
+    def __init__(self):
+        from app import app
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+
+def timed(client, method, path, body=None, headers=None):
+    start = time.perf_counter()
+    status, _ = client.request(method, path, body, headers)
+    return (time.perf_counter() - start) * 1000, status
+
+
+def report(name, results):
+    """
+    Prints latency percentiles for all responses and per status code.
+
+    Args:
+        name (str): Label of the measured endpoint.
+        results (list): `(latency_ms, status)` pairs.
+
+    Returns:
+        None
+    """
+    print(f'{name}: {len(results)} requests')
+    groups = {'all': [latency for latency, _ in results]}
+    for latency, status in results:
+        groups.setdefault(status, []).append(latency)
+    for key, latencies in groups.items():
+        print(f'  {key}: n={len(latencies)}, p50={percentile(latencies, 50):.1f} ms, '
+              f'p99={percentile(latencies, 99):.1f} ms')
+
+
+def run_burst(client, requests, concurrency, sample_interval):
+    """
+    Fires a burst of concurrent logins while sampling GET /characters.
+
+    Args:
+        client: HttpClient or TestClient.
+        requests (int): Total number of login attempts.
+        concurrency (int): Number of client threads sending them.
+        sample_interval (float): Seconds between character endpoint samples.
+
+    Returns:
+        None
+    """
+    credentials = {'username': 'user1', 'password': 'password1'}
+    status, body = client.request('POST', '/login', credentials)
+    if status != 200:
+        raise SystemExit(f'Initial login failed with status {status}')
+    headers = {'Authorization': f"Bearer {body['token']}"}
+
+    done = threading.Event()
+    character_results = []
+
+    def sample_characters():
+        while not done.is_set():
+            character_results.append(timed(client, 'GET', '/characters?limit=1&fields=id', headers=headers))
+            time.sleep(sample_interval)
+
+    sampler = threading.Thread(target=sample_characters)
+    sampler.start()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(timed, client, 'POST', '/login', credentials)
+                       for _ in range(requests)]
+            login_results = [future.result() for future in futures]
+    finally:
+        done.set()
+        sampler.join()
+
+    print(f'concurrency: {concurrency}')
+    report('POST /login', login_results)
+    report('GET /characters during the burst', character_results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark /login under a burst.')
+    parser.add_argument('--url', help='Base URL of a running server; the in-process '
+                                      'test client is used when omitted.')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--sample-interval', type=float, default=0.2)
+    args = parser.parse_args()
+    client = HttpClient(args.url) if args.url else TestClient()
+    run_burst(client, args.requests, args.concurrency, args.sample_interval)
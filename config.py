@@ -6,4 +6,25 @@ load_dotenv()
 class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('SQLALCHEMY_DATABASE_URI')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_SECRET_KEY: str = os.environ.get('JWT_SECRET_KEY')
\ No newline at end of file
+    JWT_SECRET_KEY: str = os.environ.get('JWT_SECRET_KEY')
+    MAX_LOOKUP_IDS: int = int(os.environ.get('MAX_LOOKUP_IDS', 5000))
+    USERS_FILE: str = os.environ.get(
+        'USERS_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'users.json'))
+    LOGIN_WORKERS: int = int(os.environ.get('LOGIN_WORKERS', min(4, os.cpu_count() or 1)))
+    LOGIN_MAX_PENDING: int = int(os.environ.get('LOGIN_MAX_PENDING', 8))
+    DB_POOL_SIZE: int = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW: int = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    RATE_LIMIT_PER_SECOND: float = float(os.environ.get('RATE_LIMIT_PER_SECOND', 10))
+    RATE_LIMIT_BURST: int = int(os.environ.get('RATE_LIMIT_BURST', 20))
+    RATE_LIMIT_SLOTS: int = int(os.environ.get('RATE_LIMIT_SLOTS', 4096))
+    MAX_PAGE_LIMIT: int = int(os.environ.get('MAX_PAGE_LIMIT', 100))
+    MAX_QUERY_COST: int = int(os.environ.get('MAX_QUERY_COST', 10000))
+    SERVER_BIND: str = os.environ.get('SERVER_BIND', '0.0.0.0:8000')
+    # Unset means sized from the CPU count and DB_MAX_CONNECTIONS by server.py
+    SERVER_WORKERS: int | None = int(os.environ['SERVER_WORKERS']) if os.environ.get('SERVER_WORKERS') else None
+    # Connections this application may open across all worker processes
+    DB_MAX_CONNECTIONS: int = int(os.environ.get('DB_MAX_CONNECTIONS', 90))
+    SERVER_MAX_REQUESTS: int = int(os.environ.get('SERVER_MAX_REQUESTS', 10000))
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30))
+    # Incremental backups re-export rows changed this long before the previous marker
+    BACKUP_OVERLAP_SECONDS: int = int(os.environ.get('BACKUP_OVERLAP_SECONDS', 300))
\ No newline at end of file
@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 
 
 db = SQLAlchemy()
@@ -30,6 +30,7 @@ def create_database(app):
 
         if all_tables_exist:
             print('Database already exists, skipping table creation.')
+            upgrade_schema(inspector)
         else:
             try:
                 # These imports are required for SQLAlchemy to create the tables
@@ -38,4 +39,52 @@ def create_database(app):
                 print('Database and tables created!')
             except Exception as e:
                 print(f'Error creating tables: {e}.')
-            
\ No newline at end of file
+            
+
+def upgrade_schema(inspector):
+    """
+    Adds columns introduced after the tables were first created.
+
+    `create_all()` never alters existing tables, so columns added to
+    the models later are created here. Must run inside an app context.
+
+    Args:
+        inspector (Inspector): An inspector bound to the database engine.
+
+    Returns:
+        None
+    """
+    columns = {column['name'] for column in inspector.get_columns('characters')}
+    if 'updated_at' in columns:
+        return
+
+    if db.engine.dialect.name == 'postgresql':
+        column_type = 'TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()'
+    else:
+        # SQLite only accepts constant defaults when adding a column
+        column_type = "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'"
+    with db.engine.begin() as connection:
+        connection.execute(text(f'ALTER TABLE characters ADD COLUMN updated_at {column_type}'))
+        connection.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_characters_updated_at ON characters (updated_at)'))
+    print('Added characters.updated_at column.')
+
+
+def dispose_engine(app, close=True):
+    """
+    Drops the pooled connections of the application's engine.
+
+    Call it in the parent before forking with `close=True`, and in every
+    forked worker with `close=False` so the child forgets the inherited
+    connections without closing sockets the parent may still be using.
+    New connections are opened lazily on first use.
+
+    Args:
+        app (Flask): The Flask application instance.
+        close (bool): Whether to close the checked-in connections.
+
+    Returns:
+        None
+    """
+    with app.app_context():
+        db.engine.dispose(close=close)
@@ -1,4 +1,7 @@
+import gzip
+import hashlib
 import json
+from datetime import date, datetime
 
 
 def write_file(file_path, data):
@@ -13,4 +16,33 @@ def load_data(file_path):
             data = json.load(file)
             return data
     except FileNotFoundError:
-            return data
\ No newline at end of file
+            return data
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def write_chunk(file_path, records):
+    # Compact, gzipped JSON; returns the SHA-256 of the file for the manifest
+    payload = json.dumps(records, separators=(',', ':'), default=_json_default)
+    with gzip.open(file_path, 'wb') as file:
+        file.write(payload.encode('utf-8'))
+    return file_checksum(file_path)
+
+
+def read_chunk(file_path, checksum=None):
+    if checksum is not None and file_checksum(file_path) != checksum:
+        raise ValueError(f'Checksum mismatch for {file_path}')
+    with gzip.open(file_path, 'rb') as file:
+        return json.loads(file.read().decode('utf-8'))
+
+
+def file_checksum(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
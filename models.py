@@ -1,7 +1,15 @@
+from sqlalchemy import func
 from sqlalchemy.orm import relationship
 from database import db
 
 
+# Keys of the serialized character, in response order
+CHARACTER_FIELDS = (
+    "id", "name", "house", "animal", "symbol",
+    "nickname", "role", "age", "death", "strength",
+)
+
+
 class Character(db.Model):
     __tablename__ = 'characters'
     
@@ -15,22 +23,40 @@ class Character(db.Model):
     death = db.Column(db.Integer, nullable=True)
     house_id = db.Column(db.Integer, db.ForeignKey('houses.id'), nullable=False)
     strength_id = db.Column(db.Integer, db.ForeignKey('strengthes.id'), nullable=False)
+    # Last-modified marker used by incremental backups; `default` sets it on
+    # insert even where the column was added with a constant server default
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=func.now(),
+                           server_default=func.now(), onupdate=func.now(), index=True)
     house = relationship("House")
     strength = relationship("Strength")
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "house": self.house.name,  # Access the house name
-            "animal": self.animal,
-            "symbol": self.symbol,
-            "nickname": self.nickname,
-            "role": self.role,
-            "age": self.age,
-            "death": self.death,
-            "strength": self.strength.name,  # Access the strength name
-        }
+    def to_dict(self, fields=None):
+        """
+        Serializes the character, optionally restricted to a subset of keys.
+
+        The house and strength relationships are only touched when their
+        keys are requested, so a sparse serialization never lazy-loads them.
+
+        Args:
+            fields (list | None): The keys to include, in any order.
+                All of CHARACTER_FIELDS are returned when None.
+
+        Returns:
+            dict: The serialized character.
+        """
+        if fields is None:
+            fields = CHARACTER_FIELDS
+        data = {}
+        for field in CHARACTER_FIELDS:
+            if field not in fields:
+                continue
+            if field == "house":
+                data[field] = self.house.name  # Access the house name
+            elif field == "strength":
+                data[field] = self.strength.name  # Access the strength name
+            else:
+                data[field] = getattr(self, field)
+        return data
 
 
 class House(db.Model):
@@ -0,0 +1,138 @@
+import math
+import multiprocessing
+import threading
+import time
+import zlib
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token bucket rate limiter.
+
+    Each key gets `burst` tokens that refill at `rate` tokens per second.
+    A request spends one token, and is refused when the bucket is empty.
+
+    The buckets live in a fixed-size table in shared memory, so when the
+    limiter is created before the server forks its workers (server.py
+    preloads the app), every worker spends from the same buckets and the
+    configured limits apply to the server as a whole. Keys are hashed to
+    a slot; keys that collide share a bucket, which can only make the
+    limit stricter for them.
+    """
+
+    def __init__(self, rate, burst, slots=4096):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            burst (int): Bucket capacity.
+            slots (int): Number of buckets in the shared table.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.slots = slots
+        # Two doubles per slot: tokens left and time of the last update,
+        # an update time of 0 marks a bucket that was never used
+        self._buckets = multiprocessing.Array('d', 2 * slots)
+
+    def _slot(self, key):
+        # crc32 is stable across processes, unlike the salted built-in hash
+        return zlib.crc32(str(key).encode('utf-8')) % self.slots
+
+    def acquire(self, key, cost=1):
+        """
+        Spends `cost` tokens from the bucket of `key`.
+
+        Args:
+            key (str): The bucket key, e.g. the JWT username claim.
+            cost (float): Tokens the request costs.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the number of
+                seconds until enough tokens become available.
+
+        Raises:
+            ValueError: If `cost` exceeds the bucket capacity.
+        """
+        if cost > self.burst:
+            raise ValueError(f'Cost {cost} exceeds the bucket capacity of {self.burst}')
+        index = 2 * self._slot(key)
+        now = time.monotonic()
+        with self._buckets.get_lock():
+            tokens, updated = self._buckets[index], self._buckets[index + 1]
+            if updated == 0:
+                tokens = self.burst
+            else:
+                tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+            self._buckets[index + 1] = now
+            if tokens >= cost:
+                self._buckets[index] = tokens - cost
+                return 0
+            self._buckets[index] = tokens
+            return (cost - tokens) / self.rate
+
+
+class ConcurrencyGate:
+    """
+    Non-blocking cap on the number of requests using the database at once.
+    """
+
+    def __init__(self, limit):
+        """
+        Args:
+            limit (int): Maximum number of requests admitted concurrently,
+                normally the size of the SQLAlchemy connection pool.
+        """
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def try_enter(self):
+        """
+        Returns:
+            bool: True if a slot was taken, False if the gate is full.
+        """
+        return self._slots.acquire(blocking=False)
+
+    def leave(self):
+        """Releases a slot taken by try_enter."""
+        self._slots.release()
+
+
+class AdmissionStats:
+    """
+    Counters describing admission decisions.
+
+    The counters live in shared memory, so when the instance is created
+    before the server forks its workers (server.py preloads the app),
+    every worker updates and reports the same totals.
+    """
+
+    NAMES = ('admitted', 'rate_limited', 'overloaded', 'rejected_cost', 'in_flight')
+
+    def __init__(self):
+        self._values = multiprocessing.Array('q', len(self.NAMES))
+
+    def incr(self, name, amount=1):
+        index = self.NAMES.index(name)
+        with self._values.get_lock():
+            self._values[index] += amount
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: A copy of the current counter values.
+        """
+        with self._values.get_lock():
+            return dict(zip(self.NAMES, self._values[:]))
+
+
+def retry_after_header(seconds):
+    """
+    Formats a Retry-After header for a delay in seconds.
+
+    Args:
+        seconds (float): The delay, rounded up to whole seconds.
+
+    Returns:
+        dict: The header mapping to attach to a Flask response.
+    """
+    return {'Retry-After': str(max(1, math.ceil(seconds)))}
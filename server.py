@@ -0,0 +1,146 @@
+import argparse
+import os
+import sys
+from gunicorn.app.base import BaseApplication
+from config import Config
+
+
+def warm_up(app):
+    """
+    Prepares shared state in the parent process before workers are forked.
+
+    Configures the SQLAlchemy mappers once, then drops the pooled
+    connections opened while the app was imported so no socket is
+    shared between workers. Everything loaded so far (modules, mappers,
+    hashed users) is inherited copy-on-write by the workers.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        None
+    """
+    import database
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+    database.dispose_engine(app)
+
+
+def post_fork(server, worker):
+    """
+    Gunicorn hook run in each worker right after it is forked.
+
+    When the app was preloaded in the parent, the worker discards the
+    inherited engine pool so it opens its own connections.
+    """
+    if 'app' in sys.modules:
+        import database
+        database.dispose_engine(sys.modules['app'].app, close=False)
+
+
+def connections_per_worker():
+    """
+    Returns:
+        int: The most database connections one worker process may open,
+            which is also the size of its admission gate.
+    """
+    return Config.DB_POOL_SIZE + Config.DB_MAX_OVERFLOW
+
+
+def default_workers():
+    """
+    Sizes the worker count from the CPU count, capped so that all
+    workers together stay within Config.DB_MAX_CONNECTIONS.
+
+    Returns:
+        int: The number of worker processes.
+    """
+    by_cpu = 2 * (os.cpu_count() or 1) + 1
+    by_connections = Config.DB_MAX_CONNECTIONS // connections_per_worker()
+    return max(1, min(by_cpu, by_connections))
+
+
+def worker_threads():
+    """
+    Sizes the request threads of a gthread worker.
+
+    Each worker needs a thread for every admission gate slot plus one for
+    every pending login, so a login burst cannot take the threads the
+    character endpoints are admitted on.
+
+    Returns:
+        int: The number of threads per worker.
+    """
+    return connections_per_worker() + Config.LOGIN_MAX_PENDING
+
+
+class Server(BaseApplication):
+    """
+    Pre-fork production server running the Flask app under gunicorn.
+
+    Workers are threaded (gthread), so the in-process login pool and
+    admission gate of each worker see concurrent requests.
+
+    Send SIGHUP to the master for a graceful reload of the workers and
+    SIGTERM for a graceful shutdown. Workers are recycled after
+    `max_requests` requests (with jitter) to bound memory growth.
+    """
+
+    def __init__(self, options, preload=True):
+        """
+        Args:
+            options (dict): Gunicorn settings.
+            preload (bool): Whether to import and warm the app in the
+                parent so workers share it copy-on-write.
+        """
+        self.options = options
+        self.preload = preload
+        self.application = None
+        if preload:
+            from app import app
+            warm_up(app)
+            self.application = app
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+        self.cfg.set('preload_app', self.preload)
+        self.cfg.set('post_fork', post_fork)
+
+    def load(self):
+        if self.application is None:
+            from app import app
+            self.application = app
+        return self.application
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the API with multiple worker processes.')
+    parser.add_argument('--bind', default=Config.SERVER_BIND)
+    parser.add_argument('--workers', type=int, default=Config.SERVER_WORKERS or default_workers())
+    parser.add_argument('--max-requests', type=int, default=Config.SERVER_MAX_REQUESTS,
+                        help='Recycle a worker after this many requests (0 disables).')
+    parser.add_argument('--graceful-timeout', type=int, default=Config.SERVER_GRACEFUL_TIMEOUT)
+    parser.add_argument('--no-preload', action='store_true',
+                        help='Import the app in each worker instead of once in the parent.')
+    args = parser.parse_args(argv)
+    if args.workers * connections_per_worker() > Config.DB_MAX_CONNECTIONS:
+        parser.error(f'{args.workers} workers x {connections_per_worker()} connections '
+                     f'exceed DB_MAX_CONNECTIONS ({Config.DB_MAX_CONNECTIONS})')
+
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'worker_class': 'gthread',
+        'threads': worker_threads(),
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10,
+        'graceful_timeout': args.graceful_timeout,
+    }
+    Server(options, preload=not args.no_preload).run()
+
+
+if __name__ == '__main__':
+    main()
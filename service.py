@@ -1,7 +1,61 @@
 from database import db
 from sqlalchemy import update, or_
+from sqlalchemy.orm import joinedload, load_only
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from models import Character, House, Strength
+from models import Character, House, Strength, CHARACTER_FIELDS
+
+
+def parse_fields(raw_fields):
+    """
+    Parses a comma-separated `fields` parameter into a list of character keys.
+
+    Args:
+        raw_fields (str | None): The raw parameter value, e.g. "id,name,house".
+
+    Returns:
+        list | None: The requested keys, or None when all keys are wanted.
+
+    Raises:
+        ValueError: If an unknown field is requested.
+    """
+    if not raw_fields:
+        return None
+    fields = [field.strip() for field in raw_fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in CHARACTER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields or None
+
+
+def character_load_options(fields=None):
+    """
+    Builds the loader options that fetch only what `fields` needs.
+
+    Plain columns are projected with load_only, and the house and
+    strength relationships are joined in the same query only when
+    their names are requested.
+
+    Args:
+        fields (list | None): The requested keys, or None for all of them.
+
+    Returns:
+        list: Options to pass to Query.options().
+    """
+    if fields is None:
+        return [
+            joinedload(Character.house).load_only(House.name),
+            joinedload(Character.strength).load_only(Strength.name),
+        ]
+
+    columns = [Character.id]
+    columns += [getattr(Character, field) for field in fields
+                if field not in ('id', 'house', 'strength')]
+    options = [load_only(*columns)]
+    if 'house' in fields:
+        options.append(joinedload(Character.house).load_only(House.name))
+    if 'strength' in fields:
+        options.append(joinedload(Character.strength).load_only(Strength.name))
+    return options
 
 
 def house_strength_filters(filters):
@@ -86,23 +140,62 @@ def characters_sort(unsorted_characters, sort_order, sort_by):
     return unsorted_characters.order_by(sort_function)
 
 
-def get_character(id):
+def get_character(id, fields=None):
     """
     Retrieves a character by its ID from the database.
 
     Args:
         id (int): The unique ID of the character.
+        fields (list | None): The keys to load and return, or None for all.
 
     Returns:
         dict | None: A dictionary representation of the character object if found, 
                       None otherwise.
     """
-    character = Character.query.get(id)
+    character = (
+        Character.query
+        .options(*character_load_options(fields))
+        .filter(Character.id == id)
+        .first()
+    )
     if character:
-        return character.to_dict()
+        return character.to_dict(fields)
     return None
 
 
+def get_characters_by_ids(ids, fields=None):
+    """
+    Retrieves many characters by their IDs with a single query.
+
+    The requested relationships are eager-loaded in the same query,
+    so serializing the results does not issue any extra SELECTs.
+
+    Args:
+        ids (list): The unique IDs of the characters, in the order
+            the caller wants them back. Duplicates are allowed.
+        fields (list | None): The keys to load and return, or None for all.
+
+    Returns:
+        tuple: A pair ``(characters, missing)`` where ``characters`` is a list
+            of character dictionaries in request order and ``missing`` is
+            a list of the requested IDs that were not found.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    found = {}
+    if unique_ids:
+        rows = (
+            Character.query
+            .options(*character_load_options(fields))
+            .filter(Character.id.in_(unique_ids))
+            .all()
+        )
+        found = {character.id: character.to_dict(fields) for character in rows}
+
+    characters = [found[id] for id in ids if id in found]
+    missing = [id for id in unique_ids if id not in found]
+    return characters, missing
+
+
 def create_character(data_character):
     """
     Creates a new character object and saves it to the database.
@@ -0,0 +1,47 @@
+import pytest
+from flask import Flask
+from sqlalchemy import event
+import database
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path / "api.db"}'
+    database.create_database(app)
+    with app.app_context():
+        yield app
+        database.db.session.remove()
+        database.db.engine.dispose()
+
+
+@pytest.fixture
+def characters(app):
+    db = database.db
+    from models import Character, House, Strength
+    db.session.add_all([House(id=1, name='Stark'), House(id=2, name='Lannister'),
+                        Strength(id=1, name='Bravery'), Strength(id=2, name='Cunning')])
+    db.session.flush()
+    db.session.add_all([
+        Character(id=1, name='Jon Snow', animal='Direwolf', role='King', age=25,
+                  house_id=1, strength_id=1),
+        Character(id=2, name='Arya Stark', role='Assassin', age=18, house_id=1, strength_id=2),
+        Character(id=3, name='Tyrion Lannister', role='Hand', age=39, house_id=2, strength_id=2),
+    ])
+    db.session.commit()
+    # Start each test without anything cached in the identity map
+    db.session.expunge_all()
+
+
+@pytest.fixture
+def statements(app):
+    """Collects the SQL of every statement executed during the test."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = database.db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
@@ -0,0 +1,157 @@
+import gzip
+import os
+import sqlite3
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, event, insert, select, update
+from sqlalchemy.engine import Engine
+from flask import Flask
+import backup
+import database
+import json_parcer
+from database import db
+from models import Character, House, Strength
+
+
+@pytest.fixture(autouse=True)
+def sqlite_foreign_keys():
+    # Registered before the restore pool forks, so worker engines enforce them too
+    def enable(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+    event.listen(Engine, 'connect', enable)
+    yield
+    event.remove(Engine, 'connect', enable)
+
+
+def make_database(path):
+    uri = f'sqlite:///{path}'
+    engine = create_engine(uri)
+    db.metadata.create_all(engine)
+    return uri, engine
+
+
+def character(id, name, house_id, **values):
+    return {'id': id, 'name': name, 'role': 'Knight', 'age': 30, 'house_id': house_id,
+            'strength_id': 1, **values}
+
+
+def dump(engine):
+    with engine.connect() as connection:
+        return {table.name: [dict(row) for row in connection.execute(
+                    select(table).order_by(table.c.id)).mappings()]
+                for table in backup.TABLES}
+
+
+@pytest.fixture
+def source(tmp_path):
+    uri, engine = make_database(tmp_path / 'source.db')
+    with engine.begin() as connection:
+        connection.execute(insert(House.__table__), [{'id': 1, 'name': 'Stark'},
+                                                     {'id': 2, 'name': 'Lannister'}])
+        connection.execute(insert(Strength.__table__), [{'id': 1, 'name': 'Bravery'}])
+        connection.execute(insert(Character.__table__), [character(1, 'Jon Snow', 1),
+                                                         character(2, 'Arya Stark', 1)])
+        # Unchanged for years, so incremental backups leave it out
+        connection.execute(insert(Character.__table__),
+                           [character(3, 'Old Nan', 1, updated_at=datetime(2000, 1, 1))])
+    yield uri, engine
+    engine.dispose()
+
+
+def test_chunk_round_trip_checks_checksum(tmp_path):
+    path = tmp_path / 'chunk.json.gz'
+    records = [{'id': 1, 'updated_at': datetime(2024, 5, 1, 12, 30)}]
+    checksum = json_parcer.write_chunk(path, records)
+    assert json_parcer.read_chunk(path, checksum) == [{'id': 1, 'updated_at': '2024-05-01T12:30:00'}]
+
+    with gzip.open(path, 'wb') as file:
+        file.write(b'[]')
+    with pytest.raises(ValueError):
+        json_parcer.read_chunk(path, checksum)
+
+
+def test_backup_restore_and_incremental_restore(tmp_path, source):
+    source_uri, source_engine = source
+    target_uri, target_engine = make_database(tmp_path / 'target.db')
+
+    full = backup.create_backup(tmp_path / 'full', chunk_size=2, database_uri=source_uri)
+    assert [chunk['file'] for chunk in full['chunks']] == [
+        'houses-00000.json.gz', 'strengthes-00000.json.gz',
+        'characters-00000.json.gz', 'characters-00001.json.gz']
+    assert backup.restore_backup(tmp_path / 'full', workers=2, database_uri=target_uri) == {
+        'houses': 2, 'strengthes': 1, 'characters': 3}
+    assert dump(target_engine) == dump(source_engine)
+
+    # Restoring on top of the same rows upserts them instead of failing
+    backup.restore_backup(tmp_path / 'full', workers=2, database_uri=target_uri)
+    assert dump(target_engine) == dump(source_engine)
+
+    with source_engine.begin() as connection:
+        connection.execute(update(House.__table__).where(House.__table__.c.id == 2)
+                           .values(name='Lannister of Casterly Rock'))
+        connection.execute(update(Character.__table__).where(Character.__table__.c.id == 1)
+                           .values(name='Aegon Targaryen'))
+        connection.execute(insert(Character.__table__), [character(4, 'Tyrion Lannister', 2)])
+
+    since = backup.load_marker(tmp_path / 'full')
+    incremental = backup.create_backup(tmp_path / 'incremental', since=since, database_uri=source_uri)
+    exported = json_parcer.read_chunk(
+        os.path.join(tmp_path / 'incremental', 'characters-00000.json.gz'))
+    assert sorted(row['id'] for row in exported) == [1, 2, 4]
+    assert incremental['since'] == since.isoformat()
+
+    backup.restore_backup(tmp_path / 'incremental', workers=2, database_uri=target_uri)
+    assert dump(target_engine) == dump(source_engine)
+    target_engine.dispose()
+
+
+def test_restore_rejects_tampered_chunk(tmp_path, source):
+    source_uri, _ = source
+    target_uri, target_engine = make_database(tmp_path / 'target.db')
+    manifest = backup.create_backup(tmp_path / 'full', database_uri=source_uri)
+    json_parcer.write_chunk(tmp_path / 'full' / manifest['chunks'][0]['file'], [])
+
+    with pytest.raises(ValueError):
+        backup.restore_backup(tmp_path / 'full', workers=1, database_uri=target_uri)
+    target_engine.dispose()
+
+
+def test_characters_inserted_after_schema_upgrade_reach_incremental_backups(tmp_path):
+    # A database created before characters.updated_at existed
+    connection = sqlite3.connect(tmp_path / 'api.db')
+    connection.executescript('''
+        CREATE TABLE houses (id INTEGER PRIMARY KEY, name VARCHAR(50) UNIQUE);
+        CREATE TABLE strengthes (id INTEGER PRIMARY KEY, name VARCHAR(50) NOT NULL UNIQUE);
+        CREATE TABLE characters (
+            id INTEGER PRIMARY KEY, name VARCHAR(50) NOT NULL UNIQUE,
+            animal VARCHAR(50), symbol VARCHAR(50), nickname VARCHAR(50),
+            role VARCHAR(50) NOT NULL, age INTEGER NOT NULL, death INTEGER,
+            house_id INTEGER NOT NULL REFERENCES houses (id),
+            strength_id INTEGER NOT NULL REFERENCES strengthes (id));
+        INSERT INTO houses VALUES (1, 'Stark');
+        INSERT INTO strengthes VALUES (1, 'Bravery');
+        INSERT INTO characters (id, name, role, age, house_id, strength_id)
+            VALUES (1, 'Jon Snow', 'King', 25, 1, 1);
+    ''')
+    connection.commit()
+    connection.close()
+
+    uri = f'sqlite:///{tmp_path / "api.db"}'
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    database.create_database(app)
+    full = backup.create_backup(tmp_path / 'full', database_uri=uri)
+
+    with app.app_context():
+        db.session.add(Character(id=2, name='Arya Stark', role='Assassin', age=18,
+                                 house_id=1, strength_id=1))
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+
+    since = datetime.fromisoformat(full['marker'])
+    backup.create_backup(tmp_path / 'incremental', since=since, database_uri=uri)
+    exported = json_parcer.read_chunk(tmp_path / 'incremental' / 'characters-00000.json.gz')
+    # The pre-upgrade row carries the constant default, the new one a real timestamp
+    assert [row['id'] for row in exported] == [2]
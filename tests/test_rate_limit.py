@@ -0,0 +1,105 @@
+import multiprocessing
+import pytest
+import rate_limit
+from rate_limit import TokenBucketLimiter, ConcurrencyGate, AdmissionStats, retry_after_header
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_bucket_allows_burst_then_reports_retry_after(clock):
+    limiter = TokenBucketLimiter(rate=10, burst=3)
+    assert [limiter.acquire('user1') for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire('user1') == pytest.approx(0.1)
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = TokenBucketLimiter(rate=10, burst=3)
+    for _ in range(3):
+        limiter.acquire('user1')
+    clock[0] += 0.25
+    assert limiter.acquire('user1') == 0
+    assert limiter.acquire('user1') == 0
+    assert limiter.acquire('user1') == pytest.approx(0.05)
+
+
+def test_bucket_never_exceeds_burst(clock):
+    limiter = TokenBucketLimiter(rate=10, burst=3)
+    limiter.acquire('user1')
+    clock[0] += 60
+    assert [limiter.acquire('user1') for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire('user1') > 0
+
+
+def test_buckets_are_per_key(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+    assert limiter.acquire('user1') == 0
+    assert limiter.acquire('user1') > 0
+    assert limiter.acquire('admin') == 0
+
+
+def test_bucket_charges_cost(clock):
+    limiter = TokenBucketLimiter(rate=2, burst=5)
+    assert limiter.acquire('user1', cost=4) == 0
+    assert limiter.acquire('user1', cost=3) == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        limiter.acquire('user1', cost=6)
+
+
+def test_buckets_are_shared_with_forked_processes():
+    limiter = TokenBucketLimiter(rate=0.001, burst=5)
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=limiter.acquire, args=('user1',)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert limiter.acquire('user1') == 0
+    assert limiter.acquire('user1') == 0
+    assert limiter.acquire('user1') > 0
+
+
+def test_colliding_keys_share_a_bucket(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1, slots=1)
+    assert limiter.acquire('user1') == 0
+    assert limiter.acquire('admin') > 0
+
+
+def test_gate_rejects_when_full_and_reopens():
+    gate = ConcurrencyGate(2)
+    assert gate.try_enter()
+    assert gate.try_enter()
+    assert not gate.try_enter()
+    gate.leave()
+    assert gate.try_enter()
+
+
+def test_stats_snapshot_is_a_copy():
+    stats = AdmissionStats()
+    stats.incr('admitted')
+    stats.incr('in_flight')
+    stats.incr('in_flight', -1)
+    snapshot = stats.snapshot()
+    stats.incr('admitted')
+    assert snapshot['admitted'] == 1
+    assert snapshot['in_flight'] == 0
+
+
+def test_retry_after_header_rounds_up_to_whole_seconds():
+    assert retry_after_header(0.05) == {'Retry-After': '1'}
+    assert retry_after_header(2.1) == {'Retry-After': '3'}
+
+
+def test_stats_are_shared_with_forked_processes():
+    stats = AdmissionStats()
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=stats.incr, args=('admitted',)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert stats.snapshot()['admitted'] == 3
@@ -0,0 +1,89 @@
+import pytest
+import service
+from models import Character
+
+
+def selects(statements):
+    return [statement for statement in statements if statement.lstrip().upper().startswith('SELECT')]
+
+
+def test_get_characters_by_ids_keeps_request_order_and_reports_missing(characters, statements):
+    found, missing = service.get_characters_by_ids([3, 99, 1, 3, 42, 99])
+
+    assert [character['id'] for character in found] == [3, 1, 3]
+    assert missing == [99, 42]
+    assert found[0] == {
+        'id': 3, 'name': 'Tyrion Lannister', 'house': 'Lannister', 'animal': None,
+        'symbol': None, 'nickname': None, 'role': 'Hand', 'age': 39, 'death': None,
+        'strength': 'Cunning',
+    }
+
+
+def test_get_characters_by_ids_runs_a_single_in_query(characters, statements):
+    found, _ = service.get_characters_by_ids([1, 2, 3])
+
+    assert len(found) == 3
+    [query] = selects(statements)
+    assert ' IN ' in query.upper()
+    assert 'houses' in query and 'strengthes' in query
+
+
+def test_get_characters_by_ids_with_no_ids_skips_the_query(characters, statements):
+    assert service.get_characters_by_ids([]) == ([], [])
+    assert selects(statements) == []
+
+
+def test_parse_fields():
+    assert service.parse_fields(None) is None
+    assert service.parse_fields('') is None
+    assert service.parse_fields(' , ') is None
+    assert service.parse_fields('id, name,house') == ['id', 'name', 'house']
+    with pytest.raises(ValueError, match='password, house_id'):
+        service.parse_fields('id,password,house_id')
+
+
+def test_sparse_fields_project_only_requested_columns(characters, statements):
+    character = service.get_character(1, ['name', 'age'])
+
+    assert character == {'name': 'Jon Snow', 'age': 25}
+    [query] = selects(statements)
+    assert 'characters.name' in query and 'characters.age' in query
+    assert 'characters.animal' not in query and 'characters.role' not in query
+    assert 'houses' not in query and 'strengthes' not in query
+
+
+def test_sparse_fields_join_only_requested_relations(characters, statements):
+    found, _ = service.get_characters_by_ids([3, 1], ['id', 'house'])
+
+    assert found == [{'id': 3, 'house': 'Lannister'}, {'id': 1, 'house': 'Stark'}]
+    [query] = selects(statements)
+    assert 'houses' in query and 'strengthes' not in query
+    assert 'characters.name' not in query
+
+
+def test_full_character_loads_relations_in_the_same_query(characters, statements):
+    character = service.get_character(2)
+
+    assert character['house'] == 'Stark' and character['strength'] == 'Cunning'
+    assert len(selects(statements)) == 1
+
+
+def test_list_query_with_house_filter_and_sparse_fields(characters, statements):
+    query = service.other_filters(service.house_strength_filters([{'house': 'Lan'}]),
+                                  [{'house': 'Lan'}])
+    fields = ['id', 'name', 'strength']
+    rows = query.options(*service.character_load_options(fields)).all()
+
+    assert [row.to_dict(fields) for row in rows] == [
+        {'id': 3, 'name': 'Tyrion Lannister', 'strength': 'Cunning'}]
+    assert len(selects(statements)) == 1
+
+
+def test_to_dict_keeps_field_order_and_skips_unrequested_relations(characters, statements):
+    character = (Character.query.options(*service.character_load_options(['name', 'id']))
+                 .filter(Character.id == 1).one())
+    statements.clear()
+
+    assert list(character.to_dict(['name', 'id'])) == ['id', 'name']
+    # Neither house nor strength was lazy-loaded for a sparse dict
+    assert selects(statements) == []
@@ -0,0 +1,71 @@
+import threading
+import pytest
+from werkzeug.security import generate_password_hash
+from config import Config
+from user_store import UserStore, LoginBusyError, load_users
+
+
+def make_store(**kwargs):
+    return UserStore([{'username': 'user1',
+                       'password_hash': generate_password_hash('password1'),
+                       'role': 'user'}], **kwargs)
+
+
+def test_verify_returns_role_for_valid_credentials():
+    store = make_store()
+    assert store.verify('user1', 'password1') == 'user'
+
+
+def test_verify_rejects_wrong_password_and_unknown_user():
+    store = make_store()
+    assert store.verify('user1', 'wrong') is None
+    assert store.verify('nobody', 'password1') is None
+    assert store.verify(None, 'password1') is None
+
+
+def test_get_user_keeps_only_the_hash():
+    store = make_store()
+    user = store.get_user('user1')
+    assert user['role'] == 'user'
+    assert 'password' not in user
+    assert user['password_hash'] != 'password1'
+
+
+def test_verify_raises_when_pending_limit_is_reached():
+    store = make_store(workers=1, max_pending=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_verify(username, password):
+        started.set()
+        release.wait(5)
+        return 'user'
+
+    store._verify = blocking_verify
+    worker = threading.Thread(target=store.verify, args=('user1', 'password1'))
+    worker.start()
+    assert started.wait(5)
+    try:
+        with pytest.raises(LoginBusyError):
+            store.verify('user1', 'password1')
+    finally:
+        release.set()
+        worker.join()
+
+    # The slot is released once the pending verification finishes
+    assert store.verify('user1', 'password1') == 'user'
+
+
+def test_load_users_reads_the_shipped_users_file():
+    users = load_users(Config.USERS_FILE)
+    assert {user['username'] for user in users} == {'user1', 'admin'}
+    assert all('password' not in user for user in users)
+
+
+def test_load_users_rejects_missing_or_empty_file(tmp_path):
+    with pytest.raises(ValueError, match='not found'):
+        load_users(tmp_path / 'missing.json')
+    empty = tmp_path / 'users.json'
+    empty.write_text('[]')
+    with pytest.raises(ValueError, match='no users'):
+        load_users(empty)
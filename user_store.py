@@ -0,0 +1,158 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from config import Config
+import json_parcer
+
+
+class LoginBusyError(Exception):
+    """Raised when too many password verifications are already pending."""
+
+
+class UserStore:
+    """
+    User repository indexed by username that stores hashed passwords only.
+
+    Password hashes are deliberately slow, so verification runs on a small
+    worker pool. A bounded semaphore caps how many verifications may be
+    queued or running; callers over that cap are rejected immediately
+    instead of tying up request threads.
+    """
+
+    def __init__(self, users=(), workers=None, max_pending=None):
+        """
+        Args:
+            users (iterable): Dictionaries with `username`, `password_hash`
+                and `role` keys, as produced by `python user_store.py hash`.
+            workers (int | None): Size of the verification pool.
+            max_pending (int | None): Maximum verifications queued or running.
+        """
+        self._users = {}
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers or Config.LOGIN_WORKERS,
+            thread_name_prefix='login')
+        self._slots = threading.BoundedSemaphore(max_pending or Config.LOGIN_MAX_PENDING)
+        # Verified against when the username is unknown so that missing
+        # users take as long to reject as wrong passwords
+        self._dummy_hash = generate_password_hash('dummy-password')
+        for user in users:
+            self.add_user_hash(user['username'], user['password_hash'], user['role'])
+
+    def add_user(self, username, password, role):
+        """
+        Adds or replaces a user, storing only the password hash.
+
+        Args:
+            username (str): The unique username.
+            password (str): The plaintext password to hash.
+            role (str): The user's role (e.g., "admin", "user").
+
+        Returns:
+            None
+        """
+        self.add_user_hash(username, generate_password_hash(password), role)
+
+    def add_user_hash(self, username, password_hash, role):
+        """
+        Adds or replaces a user from a pre-computed password hash.
+
+        Args:
+            username (str): The unique username.
+            password_hash (str): A werkzeug password hash.
+            role (str): The user's role (e.g., "admin", "user").
+
+        Returns:
+            None
+        """
+        self._users[username] = {
+            'password_hash': password_hash,
+            'role': role,
+        }
+
+    def get_user(self, username):
+        """
+        Looks a user up by username.
+
+        Args:
+            username (str): The username to look up.
+
+        Returns:
+            dict | None: The stored user record, or None if not found.
+        """
+        return self._users.get(username)
+
+    def _verify_and_release(self, username, password):
+        # Frees the slot before the result is published, so callers that
+        # saw the previous verification finish can take its slot
+        try:
+            return self._verify(username, password)
+        finally:
+            self._slots.release()
+
+    def _verify(self, username, password):
+        user = self._users.get(username)
+        if user is None:
+            check_password_hash(self._dummy_hash, password)
+            return None
+        if check_password_hash(user['password_hash'], password):
+            return user['role']
+        return None
+
+    def verify(self, username, password):
+        """
+        Verifies credentials on the worker pool.
+
+        Args:
+            username (str): The username to authenticate.
+            password (str): The user's password for authentication.
+
+        Returns:
+            str | None: The user's role if the credentials are valid,
+                otherwise None.
+
+        Raises:
+            LoginBusyError: If the pending verification limit is reached.
+        """
+        if not isinstance(username, str) or not isinstance(password, str):
+            return None
+        if not self._slots.acquire(blocking=False):
+            raise LoginBusyError('Too many concurrent login attempts')
+        try:
+            future = self._pool.submit(self._verify_and_release, username, password)
+        except Exception:
+            self._slots.release()
+            raise
+        return future.result()
+
+
+def load_users(file_path):
+    """
+    Reads the user records for a UserStore from a JSON file.
+
+    Args:
+        file_path (str): Path to a JSON list of users with `username`,
+            `password_hash` and `role` keys.
+
+    Returns:
+        list: The user records.
+
+    Raises:
+        ValueError: If the file is missing or holds no users, so a
+            misconfigured USERS_FILE stops the app at startup instead
+            of rejecting every login.
+    """
+    if not os.path.exists(file_path):
+        raise ValueError(f'Users file not found: {file_path}')
+    users = json_parcer.load_data(file_path)
+    if not isinstance(users, list) or not users:
+        raise ValueError(f'Users file has no users: {file_path}')
+    return users
+
+
+if __name__ == '__main__':
+    # Prints the hash to store in the users file: python user_store.py hash <password>
+    if len(sys.argv) != 3 or sys.argv[1] != 'hash':
+        sys.exit('usage: python user_store.py hash <password>')
+    print(generate_password_hash(sys.argv[2]))